@@ -1,21 +1,78 @@
 """Super Expressive library for building regular expressions."""
 
-from dataclasses import dataclass, fields
+from dataclasses import dataclass, field, fields
 import logging
 import re
-from typing import AbstractSet, Any, Optional, Sequence, Tuple, Union
+from typing import AbstractSet, Optional, Sequence, Tuple, Union
 from typing.re import Match, Pattern
 
+from superexpressive import types
 from superexpressive.types import *
 
+__all__ = ('SuperExpressive',) + types.__all__
+
 logger = logging.getLogger(__name__)
 
 STACKABLE = (ContainsChild, ContainsChildren)
 Stackable = Union[ContainsChild, ContainsChildren]
 CharT = Union[int, str]
-
-
-@dataclass(frozen=True)
+NON_BATCHABLE = STACKABLE + (StartOfInput, EndOfInput, Backreference,
+                             NamedBackReference, AsciiBackspace)
+CHARSET_FLAGS = re.ASCII | re.LOCALE | re.UNICODE
+
+# Elements without fields are immutable, so one instance is shared by all
+# builders. Stackables are not shared as they are replaced by identity.
+NOOP = Noop()
+START_OF_INPUT = StartOfInput()
+END_OF_INPUT = EndOfInput()
+ANY_CHAR = AnyChar()
+WHITESPACE_CHAR = WhitespaceChar()
+NON_WHITESPACE_CHAR = NonWhitespaceChar()
+DIGIT = Digit()
+NON_DIGIT = NonDigit()
+WORD = Word()
+NON_WORD = NonWord()
+WORD_BOUNDARY = WordBoundary()
+NON_WORD_BOUNDARY = NonWordBoundary()
+NEWLINE = Newline()
+CARRIAGE_RETURN = CarriageReturn()
+TAB = Tab()
+NULL_BYTE = NullByte()
+ASCII_BELL = AsciiBell()
+ASCII_BACKSPACE = AsciiBackspace()
+ASCII_FORMFEED = AsciiFormfeed()
+ASCII_VERTICAL_TAB = AsciiVerticalTab()
+BACKSLASH = Backslash()
+START_OF_STRING = StartOfString()
+END_OF_STRING = EndOfString()
+
+
+def _subclasses(cls: type) -> AbstractSet[type]:
+    found = {cls}
+    for subclass in cls.__subclasses__():
+        found |= _subclasses(subclass)
+    return frozenset(found)
+
+
+# Exact type lookups for the hot paths, isinstance for the rest
+CONTAINS_CHILD_TYPES = _subclasses(ContainsChild)
+CONTAINS_CHILDREN_TYPES = _subclasses(ContainsChildren)
+STACKABLE_TYPES = CONTAINS_CHILD_TYPES | CONTAINS_CHILDREN_TYPES
+
+
+def _children(element: Stackable) -> Sequence[Element]:
+    if type(element) in CONTAINS_CHILD_TYPES:
+        return element.child,
+    return element.children
+
+
+def _set_flag(flags: int, flag: int) -> int:
+    if flag & CHARSET_FLAGS:
+        flags &= ~CHARSET_FLAGS
+    return flags | flag
+
+
+@dataclass(frozen=True, slots=True)
 class SuperExpressive:
     """Super Expressive root."""
 
@@ -23,29 +80,25 @@ class SuperExpressive:
     stack: Sequence[Stackable] = (Root(),)
     named_groups: AbstractSet[str] = frozenset()
     total_capture_groups: int = 0
+    start_defined: bool = False
+    end_defined: bool = False
 
-    f_ascii: bool = False
-    f_ignorecase: bool = False
-    f_locale: bool = False
-    f_unicode: bool = True
-    f_multiline: bool = False
-    f_dotall: bool = False
+    flags: int = re.UNICODE
     f_global: bool = False
 
+    # Lazily compiled on first use
+    _pattern: Optional[Pattern] = field(default=None, init=False,
+                                        repr=False, compare=False)
+
     def _replace(self,
                  start_defined: Optional[bool] = None,
                  end_defined: Optional[bool] = None,
                  stack: Optional[Sequence[Stackable]] = None,
                  named_groups: Optional[AbstractSet[str]] = None,
                  total_capture_groups: Optional[int] = None,
-                 f_ascii: Optional[bool] = None,
-                 f_ignorecase: Optional[bool] = None,
-                 f_locale: Optional[bool] = None,
-                 f_unicode: Optional[bool] = None,
-                 f_multiline: Optional[bool] = None,
-                 f_dotall: Optional[bool] = None,
+                 flags: Optional[int] = None,
                  f_global: Optional[bool] = None) -> 'SuperExpressive':
-        kwargs = {f.name: getattr(self, f.name) for f in fields(self)}
+        kwargs = {name: getattr(self, name) for name in _FIELD_NAMES}
         if start_defined is not None:
             kwargs['start_defined'] = start_defined
         if end_defined is not None:
@@ -56,167 +109,176 @@ class SuperExpressive:
             kwargs['named_groups'] = named_groups
         if total_capture_groups is not None:
             kwargs['total_capture_groups'] = total_capture_groups
-        if f_ascii is not None:
-            if f_ascii:
-                kwargs['f_locale'] = False
-                kwargs['f_unicode'] = False
-            kwargs['f_ascii'] = f_ascii
-        if f_ignorecase is not None:
-            kwargs['f_ignorecase'] = f_ignorecase
-        if f_locale is not None:
-            if f_locale:
-                kwargs['f_ascii'] = False
-                kwargs['f_unicode'] = False
-            kwargs['f_locale'] = f_locale
-        if f_unicode is not None:
-            if f_unicode:
-                kwargs['f_ascii'] = False
-                kwargs['f_locale'] = False
-            kwargs['f_unicode'] = f_unicode
-        if f_multiline is not None:
-            kwargs['f_multiline'] = f_multiline
-        if f_dotall is not None:
-            kwargs['f_dotall'] = f_dotall
+        if flags is not None:
+            kwargs['flags'] = flags
         if f_global is not None:
             kwargs['f_global'] = f_global
         # noinspection PyArgumentList
         return type(self)(**kwargs)
 
     @property
-    def _start_defined(self) -> bool:
-        for s in self.stack:
-            if (isinstance(s, ContainsChild)
-                    and isinstance(s.child, StartOfInput)
-                    or isinstance(s, ContainsChildren)
-                    and any(isinstance(c, StartOfInput) for c in s.children)):
-                return True
-        return False
-
-    @property
-    def _end_defined(self) -> bool:
-        for s in self.stack:
-            if (isinstance(s, ContainsChild)
-                    and isinstance(s.child, StartOfInput)
-                    or isinstance(s, ContainsChildren)
-                    and any(isinstance(c, StartOfInput) for c in s.children)):
-                return True
-        return False
-
-    def _push(self, element: Element) -> 'SuperExpressive':
-        # print('pushing', repr(element))
-        # print('stack', self.stack)
-        stack = self.stack
-        current = self.stack[-1]
-
-        # Set child and propage new elements
-        new = current.add_child(element)
-        new_stack = []
-
-        previous = current
-        replaced = new
-        for stackable in reversed(stack[:-1]):
-            # print()
-            # print('stackable', repr(stackable), '::', repr(current), '->', repr(new))
-            previous, replaced = stackable, stackable.replace_child(previous, replaced)
-            new_stack.append(replaced)
-        stack = tuple(reversed(new_stack)) + (new,)
+    def _needs_merge(self) -> bool:
+        # Only captures, backreferences and anchors are rewritten when
+        # merging; backreferences need an earlier capture, so the builder
+        # state records whether any of them were added
+        return bool(self.total_capture_groups
+                    or self.named_groups
+                    or self.start_defined
+                    or self.end_defined)
 
+    def _rebuild(self, replaced: Stackable) -> list:
+        # Propagate a replaced top of the stack up to the root
+        stack = self.stack
+        previous = stack[-1]
+        new_stack = list(stack)
+        new_stack[-1] = replaced
+        for i in range(len(stack) - 2, -1, -1):
+            stackable = stack[i]
+            replaced = stackable.replace_child(previous, replaced)
+            previous = stackable
+            new_stack[i] = replaced
+        return new_stack
+
+    def _push(self, element: Element, **changes) -> 'SuperExpressive':
         # If new element is stackable, add to stack
-        if isinstance(element, STACKABLE):
-            # print()
-            # print('result', stack + (element,))
-            # print()
-            # print('-' * 80)
-            # print()
-            return self._replace(stack=stack + (element,))
-
-        # Otherwise try to pop as many ContainsChild that are now set
-        while stack and isinstance(stack[-1], ContainsChild):
-            # print()
-            # print('stack', repr(stack))
-            # print('popping', repr(stack[-1]))
-            stack = stack[:-1]
-        # print()
-        # print('result', stack)
-        # print()
-        # print('-' * 80)
-        # print()
-        return self._replace(stack=stack)
-
-    def _merge_in_element(self,
-                          element: Element,
-                          namespace: str,
-                          ignore_start_and_end: bool) -> Tuple['SuperExpressive', Element]:
-        merged = self
-        additional_capture_groups = 0
+        if type(element) in STACKABLE_TYPES:
+            new_stack = self._rebuild(self.stack[-1].add_child(element))
+            new_stack.append(element)
+            return self._replace(stack=tuple(new_stack), **changes)
+        return self._push_closed(element, **changes)
+
+    def _push_closed(self,
+                     element: Element,
+                     **changes) -> 'SuperExpressive':
+        # Add an element that will not receive any further children
+        new_stack = self._rebuild(self.stack[-1].add_child(element))
+
+        element_type = type(element)
+        start_defined = element_type is StartOfInput or None
+        end_defined = element_type is EndOfInput or None
+
+        # Try to pop as many ContainsChild that are now set
+        while new_stack and type(new_stack[-1]) in CONTAINS_CHILD_TYPES:
+            new_stack.pop()
+        return self._replace(stack=tuple(new_stack),
+                             start_defined=start_defined,
+                             end_defined=end_defined,
+                             **changes)
+
+    def _push_many(self, elements: Sequence[Element]) -> 'SuperExpressive':
+        # Only for elements that are neither stackable nor tracked by
+        # the builder state, see NON_BATCHABLE
+        expression = self
+        filled = 0
+        while (filled < len(elements)
+               and type(expression.stack[-1]) in CONTAINS_CHILD_TYPES):
+            expression = expression._push(elements[filled])
+            filled += 1
+        if filled == len(elements):
+            return expression
+        new_stack = expression._rebuild(
+            expression.stack[-1].add_children(elements[filled:])
+        )
+        return expression._replace(stack=tuple(new_stack))
 
-        if isinstance(element, Backreference):
-            index = element.index + self.total_capture_groups
-            element = Backreference(index=index)
+    def _merge_in_node(self,
+                       element: Element,
+                       namespace: str,
+                       ignore_start_and_end: bool,
+                       capture_offset: int) -> Tuple['SuperExpressive', Element]:
+        # Rewrite a single element, without looking at its children
+        element_type = type(element)
 
-        if isinstance(element, Capture):
-            additional_capture_groups += 1
+        if element_type is Backreference:
+            index = element.index + capture_offset
+            return self, Backreference(index=index)
 
-        if isinstance(element, NamedCapture):
+        if element_type is NamedBackReference:
             if namespace:
-                element = NamedCapture(children=element.children,
-                                       name=f'{namespace}{element.name}')
-            if element.name in self.named_groups:
-                raise ValueError(f'Cannot use {element.name!r} again '
-                                 f'for a capture group')
-            named_groups = set(self.named_groups)
-            named_groups.add(element.name)
-            named_groups = frozenset(named_groups)
-            merged = merged._replace(named_groups=named_groups)
-
-        if isinstance(element, NamedBackReference):
-            if namespace:
-                element = NamedBackReference(name=element.name)
+                element = NamedBackReference(name=f'{namespace}{element.name}')
+            return self, element
 
-        if isinstance(element, ContainsChild):
-            merged, new_child = merged._merge_in_element(
-                element.child,
-                namespace=namespace,
-                ignore_start_and_end=ignore_start_and_end
-            )
-            element = element.replace_child(element.child, new_child)
-
-        if isinstance(element, ContainsChildren):
-            for child in element.children:
-                merged, new_child = merged._merge_in_element(
-                    child,
-                    namespace=namespace,
-                    ignore_start_and_end=ignore_start_and_end
-                )
-                element = element.replace_child(child, new_child)
-
-        if isinstance(element, StartOfInput):
+        if element_type is StartOfInput:
             if ignore_start_and_end:
-                element = Noop()
-            elif merged._start_defined and merged.check_simple_start_and_end:
+                return self, NOOP
+            if self.start_defined and self.check_simple_start_and_end:
                 raise ValueError('The parent regex already has a '
                                  'defined start of input. You can '
                                  'ignore a subexpression\'s '
                                  'start_of_input/end_of_input markers '
                                  'with the ignore_start_and_end option')
-            elif merged._end_defined and merged.check_simple_start_and_end:
+            if self.end_defined and self.check_simple_start_and_end:
                 raise ValueError('The parent regex already has a '
                                  'defined end of input. You can '
                                  'ignore a subexpression\'s '
                                  'start_of_input/end_of_input markers '
                                  'with the ignore_start_and_end option')
+            return self._replace(start_defined=True), element
 
-        if isinstance(element, EndOfInput):
+        if element_type is EndOfInput:
             if ignore_start_and_end:
-                element = Noop()
-            elif merged._end_defined and merged.check_simple_start_and_end:
+                return self, NOOP
+            if self.end_defined and self.check_simple_start_and_end:
                 raise ValueError('The parent regex already has a '
                                  'defined end of input. You can '
                                  'ignore a subexpression\'s '
                                  'start_of_input/end_of_input markers '
                                  'with the ignore_start_and_end option')
+            return self._replace(end_defined=True), element
 
-        return merged, element
+        if element_type is Capture:
+            merged = self._replace(
+                total_capture_groups=self.total_capture_groups + 1
+            )
+            return merged, element
+
+        if element_type is NamedCapture:
+            if namespace:
+                element = NamedCapture(children=element.children,
+                                       name=f'{namespace}{element.name}')
+            if element.name in self.named_groups:
+                raise ValueError(f'Cannot use {element.name!r} again '
+                                 f'for a capture group')
+            named_groups = self.named_groups | frozenset((element.name,))
+            return self._replace(named_groups=named_groups), element
+
+        return self, element
+
+    def _merge_in_element(self,
+                          element: Element,
+                          namespace: str,
+                          ignore_start_and_end: bool) -> Tuple['SuperExpressive', Element]:
+        capture_offset = self.total_capture_groups
+        merged, element = self._merge_in_node(element, namespace,
+                                              ignore_start_and_end,
+                                              capture_offset)
+        if type(element) not in STACKABLE_TYPES:
+            return merged, element
+
+        # Depth first walk with an explicit stack of
+        # (container, remaining children, rewritten children), rebuilding
+        # each container once all of its children have been rewritten
+        frames = [(element, iter(_children(element)), [])]
+        while True:
+            container, children, rewritten = frames[-1]
+            for child in children:
+                merged, child = merged._merge_in_node(child, namespace,
+                                                      ignore_start_and_end,
+                                                      capture_offset)
+                if type(child) in STACKABLE_TYPES:
+                    frames.append((child, iter(_children(child)), []))
+                    break
+                rewritten.append(child)
+            else:
+                frames.pop()
+                if type(container) in CONTAINS_CHILD_TYPES:
+                    container = container.replace_child(container.child,
+                                                        rewritten[0])
+                else:
+                    container = container.replace_children(rewritten)
+                if not frames:
+                    return merged, container
+                frames[-1][2].append(container)
 
     # Flags ############################################################
 
@@ -226,81 +288,81 @@ class SuperExpressive:
 
     @property
     def line_by_line(self):
-        return self._replace(f_multiline=True)
+        return self._replace(flags=_set_flag(self.flags, re.MULTILINE))
 
     @property
     def case_insensitive(self):
-        return self._replace(f_ignorecase=True)
+        return self._replace(flags=_set_flag(self.flags, re.IGNORECASE))
 
     @property
     def unicode(self):
-        return self._replace(f_unicode=True)
+        return self._replace(flags=_set_flag(self.flags, re.UNICODE))
 
     @property
     def ascii(self):
-        return self._replace(f_ascii=True)
+        return self._replace(flags=_set_flag(self.flags, re.ASCII))
 
     @property
     def locale(self):
-        return self._replace(f_locale=True)
+        return self._replace(flags=_set_flag(self.flags, re.LOCALE))
 
     @property
     def single_line(self):
-        return self._replace(f_dotall=True)
+        return self._replace(flags=_set_flag(self.flags, re.DOTALL))
 
     # Elements #########################################################
 
     @property
     def any_char(self) -> 'SuperExpressive':
-        return self._push(AnyChar())
+        return self._push(ANY_CHAR)
 
     @property
     def whitespace_char(self) -> 'SuperExpressive':
-        return self._push(WhitespaceChar())
+        return self._push(WHITESPACE_CHAR)
 
     @property
     def non_whitespace_char(self) -> 'SuperExpressive':
-        return self._push(NonWhitespaceChar())
+        return self._push(NON_WHITESPACE_CHAR)
 
     @property
     def digit(self) -> 'SuperExpressive':
-        return self._push(Digit())
+        return self._push(DIGIT)
 
     @property
     def non_digit(self) -> 'SuperExpressive':
-        return self._push(NonDigit())
+        return self._push(NON_DIGIT)
 
     @property
     def word(self) -> 'SuperExpressive':
-        return self._push(Word())
+        return self._push(WORD)
 
     @property
     def non_word(self) -> 'SuperExpressive':
-        return self._push(NonWord())
+        return self._push(NON_WORD)
 
     @property
     def word_boundary(self) -> 'SuperExpressive':
-        return self._push(WordBoundary())
+        return self._push(WORD_BOUNDARY)
 
     @property
     def non_word_boundary(self) -> 'SuperExpressive':
-        return self._push(NonWordBoundary())
+        return self._push(NON_WORD_BOUNDARY)
 
     @property
     def newline(self) -> 'SuperExpressive':
-        return self._push(Newline())
+        return self._push(NEWLINE)
 
     @property
     def carriage_return(self) -> 'SuperExpressive':
-        return self._push(CarriageReturn())
+        return self._push(CARRIAGE_RETURN)
 
     @property
     def tab(self) -> 'SuperExpressive':
-        return self._push(Tab())
+        return self._push(TAB)
 
     @property
     def null_byte(self) -> 'SuperExpressive':
-        return self._push(NullByte())
+        return self._push(NULL_BYTE)
 
     def named_backreference(self, name: str) -> 'SuperExpressive':
         if name not in self.named_groups:
@@ -309,7 +371,7 @@ class SuperExpressive:
         return self._push(NamedBackReference(name=name))
 
     def backreference(self, index: int) -> 'SuperExpressive':
-        if not 0 <= index <= self.total_capture_groups:
+        if not 1 <= index <= self.total_capture_groups:
             raise ValueError(f'Invalid index {index}. There are '
                              f'{self.total_capture_groups} capture '
                              f'groups on this SuperExpression')
@@ -333,18 +395,14 @@ class SuperExpressive:
 
     @property
     def capture(self) -> 'SuperExpressive':
-        return (self
-                ._push(Capture())
-                ._replace(total_capture_groups=self.total_capture_groups + 1))
+        return self._push(Capture(),
+                          total_capture_groups=self.total_capture_groups + 1)
 
     def named_capture(self, name: str) -> 'SuperExpressive':
         if name in self.named_groups:
             raise ValueError(f'Cannot use {name!r} again for a capture group')
-        named_groups = set(self.named_groups)
-        named_groups.add(name)
-        return (self
-                ._push(NamedCapture(name=name))
-                ._replace(named_groups=frozenset(named_groups)))
+        named_groups = self.named_groups | frozenset((name,))
+        return self._push(NamedCapture(name=name), named_groups=named_groups)
 
     def _quantify(self, quantifier: Quantifier) -> 'SuperExpressive':
         if isinstance(self.stack[-1], Quantifier):
@@ -388,20 +446,20 @@ class SuperExpressive:
 
     @property
     def start_of_input(self) -> 'SuperExpressive':
-        if self._start_defined and self.check_simple_start_and_end:
+        if self.start_defined and self.check_simple_start_and_end:
             raise RuntimeError('This regex already has a defined start '
                                'of input')
-        if self._end_defined and self.check_simple_start_and_end:
+        if self.end_defined and self.check_simple_start_and_end:
             raise RuntimeError('Cannot define the start of input after '
                                'the end of input')
-        return self._push(StartOfInput())
+        return self._push(START_OF_INPUT)
 
     @property
     def end_of_input(self) -> 'SuperExpressive':
-        if self._end_defined and self.check_simple_start_and_end:
+        if self.end_defined and self.check_simple_start_and_end:
             raise RuntimeError('This regex already has a defined end '
                                'of input')
-        return self._push(EndOfInput())
+        return self._push(END_OF_INPUT)
 
     def any_of_chars(self, chars: str) -> 'SuperExpressive':
         return self._push(AnyOfChars(chars))
@@ -416,7 +474,7 @@ class SuperExpressive:
 
         # Pop element and try to pop as many ContainsChild that are now set
         stack = self.stack[:-1]
-        while stack and isinstance(stack[-1], ContainsChild):
+        while stack and type(stack[-1]) in CONTAINS_CHILD_TYPES:
             stack = stack[:-1]
         return self._replace(stack=stack)
 
@@ -443,6 +501,9 @@ class SuperExpressive:
                       namespace: str = '',
                       ignore_flags: bool = True,
                       ignore_start_and_end: bool = True) -> 'SuperExpressive':
+        if not isinstance(expression, SuperExpressive):
+            raise TypeError(f'subexpression must be a SuperExpressive '
+                            f'(got {expression!r})')
         if len(expression.stack) != 1:
             raise ValueError(f'Cannot call subexpression with a not '
                              f'yet fully specified regex object. (Try '
@@ -450,65 +511,73 @@ class SuperExpressive:
                              f'{expression.stack[-1]} on the '
                              f'subexpression)')
 
-        element: Root
-        merged, element = self._merge_in_element(
-            expression.stack[0],
-            namespace=namespace,
-            ignore_start_and_end=ignore_start_and_end
-        )
+        merged = self
+        element = Subexpression(children=expression.stack[0].children)
+        if expression._needs_merge:
+            merged, element = self._merge_in_element(
+                element,
+                namespace=namespace,
+                ignore_start_and_end=ignore_start_and_end
+            )
 
         if not ignore_flags:
-            if (self.f_unicode != expression.f_unicode
-                    or self.f_ascii != expression.f_ascii
-                    or self.f_locale != expression.f_locale):
+            if (self.flags ^ expression.flags) & CHARSET_FLAGS:
                 raise ValueError(f'Incompatible flags from '
-                                 f'subexpression ({expression.flags}) '
-                                 f'and root expression ({merged.flags}). '
+                                 f'subexpression '
+                                 f'({re.RegexFlag(expression.flags)!r}) '
+                                 f'and root expression '
+                                 f'({re.RegexFlag(merged.flags)!r}). '
                                  f'You can ignore the subexpression '
                                  f'flags with the ignore_flags option')
-            if expression.f_ignorecase:
-                merged = self._replace(f_ignorecase=True)
-            if expression.f_multiline:
-                merged = self._replace(f_multiline=True)
-            if expression.f_dotall:
-                merged = self._replace(f_dotall=True)
-            if expression.f_global:
-                merged = self._replace(f_global=True)
+            merged = merged._replace(
+                flags=merged.flags | expression.flags,
+                f_global=merged.f_global or expression.f_global
+            )
 
-        return merged._push(Subexpression(children=element.children)).end()
+        return merged._push_closed(element)
+
+    def then(self, *elements: Element) -> 'SuperExpressive':
+        for element in elements:
+            if not isinstance(element, Element):
+                raise TypeError(f'then only accepts elements '
+                                f'(got {element!r})')
+            if isinstance(element, NON_BATCHABLE):
+                raise ValueError(f'Cannot add {element!r} with then, use '
+                                 f'the matching builder method instead')
+        return self._push_many(elements)
 
     # Python Specific ##################################################
 
     @property
     def ascii_bell(self) -> 'SuperExpressive':
-        return self._push(AsciiBell())
+        return self._push(ASCII_BELL)
 
     @property
     def ascii_backspace(self) -> 'SuperExpressive':
         if not isinstance(self.stack[-1], AnyOf):
             raise RuntimeError(f'Can only use ASCII backsppace within '
                                f'an any_of group')
-        return self._push(AsciiBackspace())
+        return self._push(ASCII_BACKSPACE)
 
     @property
     def ascii_formfeed(self) -> 'SuperExpressive':
-        return self._push(AsciiFormfeed())
+        return self._push(ASCII_FORMFEED)
 
     @property
     def ascii_vertical_tab(self) -> 'SuperExpressive':
-        return self._push(AsciiVerticalTab())
+        return self._push(ASCII_VERTICAL_TAB)
 
     @property
     def backslash(self) -> 'SuperExpressive':
-        return self._push(Backslash())
+        return self._push(BACKSLASH)
 
     @property
     def start_of_string(self) -> 'SuperExpressive':
-        return self._push(StartOfString())
+        return self._push(START_OF_STRING)
 
     @property
     def end_of_string(self) -> 'SuperExpressive':
-        return self._push(EndOfString())
+        return self._push(END_OF_STRING)
 
     def hex_char(self, code: str) -> 'SuperExpressive':
         return self._push(Hex(code=code))
@@ -518,28 +587,20 @@ class SuperExpressive:
 
     # Evaluation / casting #############################################
 
-    @property
-    def _flags(self) -> int:
-        return ((re.ASCII if self.f_ascii else 0)
-                | (re.IGNORECASE if self.f_ignorecase else 0)
-                | (re.LOCALE if self.f_locale else 0)
-                | (re.UNICODE if self.f_unicode else 0)
-                | (re.MULTILINE if self.f_multiline else 0)
-                | (re.DOTALL if self.f_dotall else 0))
-
     def compile(self) -> Pattern:
-        return re.compile(str(self), flags=self._flags)
+        if self._pattern is None:
+            object.__setattr__(self, '_pattern',
+                               re.compile(str(self), flags=self.flags))
+        return self._pattern
 
     def match(self, string: str) -> Optional[Match]:
         if self.f_global:
-            return re.findall(str(self), string, flags=self._flags)
-        return re.match(str(self), string, flags=self._flags)
-
-    def __getattr__(self, item: str) -> Any:
-        snake_cased = ''.join(c if c.islower() else f'_{c.lower()}'
-                              for c in item)
-        print('trying', snake_cased)
-        return super().__getattribute__(snake_cased)
+            return self.compile().findall(string)
+        return self.compile().match(string)
 
     def __str__(self) -> str:
+        # The root caches its own rendering and that of its finished children
         return str(self.stack[0])
+
+
+_FIELD_NAMES = tuple(f.name for f in fields(SuperExpressive) if f.init)
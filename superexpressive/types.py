@@ -1,7 +1,9 @@
 """Meta types for regex structures."""
 
-from abc import ABC, abstractmethod
-from dataclasses import dataclass, fields
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from operator import attrgetter
+import re
 from string import ascii_letters, digits, hexdigits
 from typing import Optional as Optional_, Sequence, Union
 
@@ -22,91 +24,175 @@ __all__ = ('Element', 'ContainsChild', 'ContainsChildren', 'Quantifier',
 import unicodedata
 
 HEX_DIGITS = set(hexdigits)
+HEX_CODE = re.compile(r'[0-9A-Fa-f]+')
 GROUP_NAME_CHARS = set(ascii_letters + digits + '_')
+GROUP_NAME = re.compile(r'[A-Za-z][A-Za-z0-9_]*')
 SPECIAL_CHARS = set('\\.^$|?*+()[]{}-')
 ESCAPE_TABLE = {ord(c): f'\\{c}' for c in SPECIAL_CHARS}
 
 
+def _as_char(value: Union[int, str]) -> str:
+    if isinstance(value, int):
+        return chr(value)
+    return value
+
+
+def _escape_char(char: str) -> str:
+    # Single characters skip building a new string through str.translate
+    return ESCAPE_TABLE.get(ord(char), char)
+
+
 class Element:
-    pass
+    __slots__ = ()
 
 
-@dataclass(frozen=True)
-class ContainsChild(Element):
+def _join(elements: Sequence[Element]) -> str:
+    # Calling __str__ directly skips the str() constructor, and a list lets
+    # str.join size the result up front
+    return ''.join([e.__str__() for e in elements])
+
+
+@lru_cache(maxsize=None)
+def _copy_field_names(cls: type) -> Sequence[str]:
+    # Fields to carry over when rebuilding a container with new children,
+    # including precomputed ones such as a quantifier symbol
+    return tuple(f.name for f in fields(cls)
+                 if f.name not in ('child', 'children', '_string', '_joined'))
+
+
+def _copy_with(element: Element, name: str, value: object):
+    # Copy a validated element, skipping __init__ and __post_init__
+    cls = type(element)
+    new = cls.__new__(cls)
+    for field_name in _copy_field_names(cls):
+        object.__setattr__(new, field_name, getattr(element, field_name))
+    object.__setattr__(new, name, value)
+    object.__setattr__(new, '_string', None)
+    return new
+
+
+class _CachedStr(Element):
+    """Element rendered once, subclasses provide _render and _string."""
+
+    __slots__ = ()
+
+    def __str__(self) -> str:
+        # Elements are immutable, so the rendering is computed only once
+        if self._string is None:
+            object.__setattr__(self, '_string', self._render())
+        return self._string
+
+
+@dataclass(frozen=True, slots=True)
+class ContainsChild(_CachedStr):
     """Lazy way of handling deferred types with a child."""
 
     child: Optional_[Element] = None
+    _string: Optional_[str] = field(default=None, init=False,
+                                    repr=False, compare=False)
+
+    def _render(self) -> str:
+        if self.child is None:
+            return ''
+        return str(self.child)
 
     def replace_child(self, old: Element, new: Element):
-        kwargs = {f.name: getattr(self, f.name) for f in fields(self)}
-        child: Element = kwargs.pop('child')
-        if child is not old:
+        if self.child is not old:
             raise ValueError(f'Could not find {old!r} as child of {self!r}')
-        kwargs['child'] = new
-        # noinspection PyArgumentList
-        return type(self)(**kwargs)
+        return _copy_with(self, 'child', new)
 
     def add_child(self, child: Element):
         if self.child is not None:
             raise RuntimeError(f'Setting a non-None child on {self!r}')
-        kwargs = {f.name: getattr(self, f.name) for f in fields(self)}
-        kwargs['child'] = child
-        # noinspection PyArgumentList
-        return type(self)(**kwargs)
+        return _copy_with(self, 'child', child)
 
 
-@dataclass(frozen=True)
-class ContainsChildren(Element):
+@dataclass(frozen=True, slots=True)
+class ContainsChildren(_CachedStr):
     """Lazy way of handling deferred types with children."""
 
     children: Sequence[Element] = tuple()
+    _string: Optional_[str] = field(default=None, init=False,
+                                    repr=False, compare=False)
+    # Rendering of all children but the last one, which may still be
+    # under construction on the builder stack
+    _joined: str = field(default='', init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, '_joined',
+                           _join(self.children[:-1]))
+
+    @property
+    def _joined_children(self) -> str:
+        if not self.children:
+            return ''
+        return self._joined + self.children[-1].__str__()
+
+    def _copy(self, children: Sequence[Element], joined: str):
+        new = _copy_with(self, 'children', children)
+        object.__setattr__(new, '_joined', joined)
+        return new
+
+    def _render(self) -> str:
+        return self._joined_children
 
     def replace_child(self, old: Element, new: Element):
-        kwargs = {f.name: getattr(self, f.name) for f in fields(self)}
-        children: Sequence[Element] = kwargs.pop('children')
-        kwargs['children'] = tuple(new if c is old else c for c in children)
-        if not any(c is new for c in kwargs['children']):
+        if self.children and self.children[-1] is old:
+            # The builder only replaces the open container at the end, which
+            # is never shared, so the rendered prefix stays valid
+            return self._copy(tuple(self.children[:-1]) + (new,), self._joined)
+        children = tuple(new if c is old else c for c in self.children)
+        if not any(c is new for c in children):
             raise ValueError(f'Could not find {new!r} in children of {self!r}')
-        # noinspection PyArgumentList
-        return type(self)(**kwargs)
+        return self.replace_children(children)
+
+    def replace_children(self, children: Sequence[Element]):
+        children = tuple(children)
+        return self._copy(children, _join(children[:-1]))
 
     def add_child(self, child: Element):
-        kwargs = {f.name: getattr(self, f.name) for f in fields(self)}
-        children: Sequence[Element] = kwargs.pop('children')
-        kwargs['children'] = tuple(children) + (child,)
-        # noinspection PyArgumentList
-        return type(self)(**kwargs)
+        return self._copy(tuple(self.children) + (child,),
+                          self._joined_children)
 
+    def add_children(self, children: Sequence[Element]):
+        start = max(len(self.children) - 1, 0)
+        children = tuple(self.children) + tuple(children)
+        return self._copy(children,
+                          self._joined + _join(children[start:-1]))
 
-class Quantifier(ContainsChild, ABC):
 
-    @property
-    @abstractmethod
-    def symbol(self) -> str:
-        return NotImplemented
+@dataclass(frozen=True, slots=True)
+class Quantifier(ContainsChild):
+    """Quantifier applied to a child, subclasses set the symbol."""
 
-    def __str__(self) -> str:
-        inner = str(self.child)
+    symbol: str = field(default='', init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if type(self) is Quantifier:
+            raise TypeError('Quantifier is abstract, use a subclass')
+
+    def _render(self) -> str:
+        inner = ContainsChild._render(self)
         if isinstance(self.child, QuantifierRequiresGroup):
             inner = f'(?:{inner})'
         return f'{inner}{self.symbol}'
 
 
 class QuantifierRequiresGroup(Element):
-    pass
+    __slots__ = ()
 
 
 # Type definitions
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Root(ContainsChildren, QuantifierRequiresGroup, Element):
     """Root element."""
 
-    def __str__(self) -> str:
-        return ''.join(map(str, self.children))
+    def _render(self) -> str:
+        return self._joined_children
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Noop(Element):
     """Noop element."""
 
@@ -114,7 +200,7 @@ class Noop(Element):
         return ''
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StartOfInput(Element):
     """Start of input element."""
 
@@ -122,7 +208,7 @@ class StartOfInput(Element):
         return '^'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EndOfInput(Element):
     """End of input element."""
 
@@ -130,7 +216,7 @@ class EndOfInput(Element):
         return '$'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AnyChar(Element):
     """Any char element."""
 
@@ -138,7 +224,7 @@ class AnyChar(Element):
         return '.'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class WhitespaceChar(Element):
     """Whitespace char element."""
 
@@ -146,7 +232,7 @@ class WhitespaceChar(Element):
         return r'\s'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NonWhitespaceChar(Element):
     """Non whitespace char element."""
 
@@ -154,7 +240,7 @@ class NonWhitespaceChar(Element):
         return r'\S'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Digit(Element):
     """Digit element."""
 
@@ -162,7 +248,7 @@ class Digit(Element):
         return r'\d'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NonDigit(Element):
     """Non digit element."""
 
@@ -170,7 +256,7 @@ class NonDigit(Element):
         return r'\D'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Word(Element):
     """Word element."""
 
@@ -178,7 +264,7 @@ class Word(Element):
         return r'\w'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NonWord(Element):
     """Non word element."""
 
@@ -186,7 +272,7 @@ class NonWord(Element):
         return r'\W'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class WordBoundary(Element):
     """Word boundary element."""
 
@@ -194,7 +280,7 @@ class WordBoundary(Element):
         return r'\b'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NonWordBoundary(Element):
     """Non word boundary element."""
 
@@ -202,7 +288,7 @@ class NonWordBoundary(Element):
         return r'\B'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Newline(Element):
     """Newline element."""
 
@@ -210,7 +296,7 @@ class Newline(Element):
         return r'\n'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CarriageReturn(Element):
     """Carriage return element."""
 
@@ -218,7 +304,7 @@ class CarriageReturn(Element):
         return r'\r'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Tab(Element):
     """Tab element."""
 
@@ -226,7 +312,7 @@ class Tab(Element):
         return r'\t'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NullByte(Element):
     """Null byte element."""
 
@@ -234,38 +320,40 @@ class NullByte(Element):
         return r'\x00'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AnyOfChars(Element):
     """Any of chars element."""
     chars: str
-
-    @property
-    def chars_escaped(self) -> str:
-        return self.chars.translate(ESCAPE_TABLE)
+    chars_escaped: str = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if not self.chars:
             raise ValueError('chars must have at least one character')
+        object.__setattr__(self, 'chars_escaped',
+                           self.chars.translate(ESCAPE_TABLE))
 
     def __str__(self) -> str:
         return f'[{self.chars_escaped}]'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AnythingButString(Element):
     """Anything but string element."""
     string: str
+    _string: str = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if not self.string:
             raise ValueError('string must have at least one character')
+        negated = ''.join([f'[^{_escape_char(c)}]'
+                           for c in self.string])
+        object.__setattr__(self, '_string', f'(?:{negated})')
 
     def __str__(self) -> str:
-        negated = ''.join(f'[^{c.translate(ESCAPE_TABLE)}]' for c in self.string)
-        return f'(?:{negated})'
+        return self._string
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AnythingButChars(AnyOfChars):
     """Anything but chars element."""
 
@@ -273,97 +361,101 @@ class AnythingButChars(AnyOfChars):
         return f'[^{self.chars_escaped}]'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AnythingButRange(Element):
     """Anything but range element."""
 
     low: Union[int, str]
     high: Union[int, str]
+    range_escaped: str = field(init=False, repr=False, compare=False)
 
     @property
     def _low(self) -> str:
-        if isinstance(self.low, int):
-            return chr(self.low)
-        return self.low
+        return _as_char(self.low)
 
     @property
     def low_escaped(self) -> str:
-        return self._low.translate(ESCAPE_TABLE)
+        return _escape_char(self._low)
 
     @property
     def _high(self) -> str:
-        if isinstance(self.high, int):
-            return chr(self.high)
-        return self.high
+        return _as_char(self.high)
 
     @property
     def high_escaped(self) -> str:
-        return self._high.translate(ESCAPE_TABLE)
+        return _escape_char(self._high)
 
     def __post_init__(self) -> None:
         try:
-            _ = self._low
+            low = _as_char(self.low)
         except ValueError as e:
             raise ValueError(f'Invalid low {self.low!r}') from e
         try:
-            _ = self._high
+            high = _as_char(self.high)
         except ValueError as e:
             raise ValueError(f'Invalid low {self.high!r}') from e
-        if len(self._low) != 1:
+        if len(low) != 1:
             raise ValueError(f'low must be a single character or '
                              f'number (got {self.low!r}')
-        if len(self._high) != 1:
+        if len(high) != 1:
             raise ValueError(f'low must be a single character or '
                              f'number (got {self.high!r}')
-        if ord(self._low) >= ord(self._high):
+        if ord(low) >= ord(high):
             raise ValueError(f'low must have a smaller character value '
                              f'than high (low = {self.low!r}, '
                              f'high = {self.high!r})')
+        object.__setattr__(self, 'range_escaped',
+                           f'{_escape_char(low)}-{_escape_char(high)}')
 
     def __str__(self) -> str:
-        return f'[^{self.low_escaped}-{self.high_escaped}]'
+        return f'[^{self.range_escaped}]'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Char(Element):
     """Char element."""
 
     char: Union[int, str]
+    char_escaped: str = field(init=False, repr=False, compare=False)
 
     @property
     def _char(self) -> str:
-        if isinstance(self.char, int):
-            return chr(self.char)
-        return self.char
-
-    @property
-    def char_escaped(self) -> str:
-        return self._char.translate(ESCAPE_TABLE)
+        return _as_char(self.char)
 
     def __post_init__(self) -> None:
         if isinstance(self.char, str):
             if len(self.char) != 1:
                 raise ValueError(f'char can only be a single '
                                  f'character (got {self.char!r}')
+            char = self.char
         else:
             try:
-                chr(self.char)
+                char = chr(self.char)
             except ValueError as e:
                 raise ValueError(f'Invalid char {self.char!r}') from e
+        object.__setattr__(self, 'char_escaped', _escape_char(char))
 
     def __str__(self) -> str:
         return self.char_escaped
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Range(AnythingButRange):
     """Range element."""
 
     def __str__(self) -> str:
-        return f'[{self.low_escaped}-{self.high_escaped}]'
+        return f'[{self.range_escaped}]'
 
 
-@dataclass(frozen=True)
+# Character class fragments that AnyOf fuses into a single set
+_FUSE_MAP = {
+    Char: attrgetter('char_escaped'),
+    AnyOfChars: attrgetter('chars_escaped'),
+    Range: attrgetter('range_escaped'),
+}
+
+
+@dataclass(frozen=True, slots=True)
 class String(QuantifierRequiresGroup, Element):
     """String element."""
     string: str
@@ -376,7 +468,7 @@ class String(QuantifierRequiresGroup, Element):
         return self.string.translate(ESCAPE_TABLE)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NamedBackReference(Element):
     """Named backreference element."""
     name: str
@@ -384,7 +476,7 @@ class NamedBackReference(Element):
     def __post_init__(self) -> None:
         if not self.name:
             raise ValueError('Name must be at least one character')
-        if set(self.name) - GROUP_NAME_CHARS or not self.name[0].isalpha():
+        if not GROUP_NAME.fullmatch(self.name):
             raise ValueError(f'Name {self.name} is not valid '
                              f'(only letters, numbers, and underscore)')
 
@@ -392,7 +484,7 @@ class NamedBackReference(Element):
         return f'\\g<{self.name}>'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Backreference(Element):
     """Backreference element"""
     index: int
@@ -405,73 +497,68 @@ class Backreference(Element):
         return f'\\{self.index}'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Capture(ContainsChildren, Element):
     """Capture element."""
 
-    def __str__(self) -> str:
-        inner = ''.join(map(str, self.children))
-        return f'({inner})'
+    def _render(self) -> str:
+        return f'({self._joined_children})'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Subexpression(ContainsChildren, QuantifierRequiresGroup, Element):
     """Subexpression element."""
 
-    def __str__(self) -> str:
-        return ''.join(map(str, self.children))
+    def _render(self) -> str:
+        return self._joined_children
 
 
 @dataclass(frozen=True)
 class _NamedCapture:
+    # Field order only, so the name comes first in the signature
+    __slots__ = ()
+
     name: str
-    children = tuple()
+    children: Sequence[Element] = tuple()
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NamedCapture(ContainsChildren, _NamedCapture, Element):
     """Named capture element."""
 
     def __post_init__(self) -> None:
         if not self.name:
             raise ValueError('Name must be at least one character')
-        if set(self.name) - GROUP_NAME_CHARS or not self.name[0].isalpha():
+        if not GROUP_NAME.fullmatch(self.name):
             raise ValueError(f'Name {self.name} is not valid '
                              f'(only letters, numbers, and underscore)')
+        ContainsChildren.__post_init__(self)
 
-    def __str__(self) -> str:
-        inner = ''.join(map(str, self.children))
-        return f'(?P<{self.name}>{inner})'
+    def _render(self) -> str:
+        return f'(?P<{self.name}>{self._joined_children})'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Group(ContainsChildren, Element):
     """Group element."""
 
-    def __str__(self) -> str:
-        inner = ''.join(map(str, self.children))
-        return f'(?:{inner})'
+    def _render(self) -> str:
+        return f'(?:{self._joined_children})'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AnyOf(ContainsChildren, Element):
     """Any of element."""
 
-    def __str__(self) -> str:
+    def _render(self) -> str:
         fusable = []
+        inner_bits = []
         for child in self.children:
-            if type(child) is Char:
-                child: Char
-                fusable.append(child.char_escaped)
-            elif type(child) is AnyOfChars:
-                child: AnyOfChars
-                fusable.append(child.chars_escaped)
-            elif type(child) is Range:
-                child: Range
-                fusable.append(f'{child.low_escaped}-{child.high_escaped}')
-
-        inner_bits = [str(child) for child in self.children
-                      if not type(child) in {Char, AnyOfChars, Range}]
+            fragment = _FUSE_MAP.get(type(child))
+            if fragment is not None:
+                fusable.append(fragment(child))
+            else:
+                inner_bits.append(str(child))
 
         if fusable:
             if not inner_bits:
@@ -483,136 +570,123 @@ class AnyOf(ContainsChildren, Element):
         return f'(?:{inner})'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AssertAhead(ContainsChildren, Element):
     """Assert ahead element."""
 
-    def __str__(self) -> str:
-        inner = ''.join(map(str, self.children))
-        return f'(?={inner})'
+    def _render(self) -> str:
+        return f'(?={self._joined_children})'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AssertNotAhead(ContainsChildren, Element):
     """Assert not ahead element."""
 
-    def __str__(self) -> str:
-        inner = ''.join(map(str, self.children))
-        return f'(?!{inner})'
+    def _render(self) -> str:
+        return f'(?!{self._joined_children})'
 
 
 # Quantifiers
 
 @dataclass(frozen=True)
 class _Exactly:
+    # Field order only, so the count comes first in the signature
+    __slots__ = ()
+
     times: int
     child: Optional_[Element] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Exactly(Quantifier, _Exactly):
     """Exactly element."""
 
-    @property
-    def symbol(self) -> str:
-        return f'{{{self.times}}}'
-
     def __post_init__(self) -> None:
         if self.times <= 0:
             raise ValueError(f'times must be a positive integer '
                              f'(got {self.times})')
+        object.__setattr__(self, 'symbol', f'{{{self.times}}}')
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AtLeast(Exactly):
     """At least element."""
 
-    @property
-    def symbol(self) -> str:
-        return f'{{{self.times},}}'
+    def __post_init__(self) -> None:
+        Exactly.__post_init__(self)
+        object.__setattr__(self, 'symbol', f'{{{self.times},}}')
 
 
 @dataclass(frozen=True)
 class _Between:
-    """Between element."""
+    # Field order only, so the bounds come first in the signature
+    __slots__ = ()
+
     low: int
     high: int
     child: Optional_[Element] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Between(Quantifier, _Between):
     """Between element."""
 
-    @property
-    def symbol(self) -> str:
-        return f'{{{self.low},{self.high}}}'
-
     def __post_init__(self) -> None:
         if self.low < 0:
             raise ValueError(f'low must be a non-negative integer (got {self.low})')
         if self.low >= self.high:
             raise ValueError(f'low must be less than high '
                              f'(low = {self.low}, high = {self.high})')
+        object.__setattr__(self, 'symbol', f'{{{self.low},{self.high}}}')
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BetweenLazy(Between):
     """Between lazy element."""
 
-    @property
-    def symbol(self) -> str:
-        return super().symbol + '?'
+    def __post_init__(self) -> None:
+        Between.__post_init__(self)
+        object.__setattr__(self, 'symbol', f'{{{self.low},{self.high}}}?')
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ZeroOrMore(Quantifier):
     """Zero or more element."""
 
-    @property
-    def symbol(self) -> str:
-        return r'*'
+    symbol: str = field(default='*', init=False, repr=False, compare=False)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ZeroOrMoreLazy(ZeroOrMore):
     """Zero or more lazy element."""
 
-    @property
-    def symbol(self) -> str:
-        return super().symbol + '?'
+    symbol: str = field(default='*?', init=False, repr=False, compare=False)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OneOrMore(Quantifier):
     """One or more element."""
 
-    @property
-    def symbol(self) -> str:
-        return '+'
+    symbol: str = field(default='+', init=False, repr=False, compare=False)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OneOrMoreLazy(OneOrMore):
     """One or more lazy element."""
 
-    @property
-    def symbol(self) -> str:
-        return super().symbol + '?'
+    symbol: str = field(default='+?', init=False, repr=False, compare=False)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Opt(Quantifier):
     """Optional element."""
 
-    @property
-    def symbol(self) -> str:
-        return '?'
+    symbol: str = field(default='?', init=False, repr=False, compare=False)
 
 
 # Python specific
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AsciiBell(Element):
     """ASCII bell element."""
 
@@ -620,7 +694,7 @@ class AsciiBell(Element):
         return r'\a'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AsciiBackspace(Element):
     """ASCII backspace element."""
 
@@ -628,7 +702,7 @@ class AsciiBackspace(Element):
         return r'\b'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AsciiFormfeed(Element):
     """ASCII fromfeed element."""
 
@@ -636,7 +710,7 @@ class AsciiFormfeed(Element):
         return r'\f'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AsciiVerticalTab(Element):
     """ASCII vertical tab element."""
 
@@ -644,7 +718,7 @@ class AsciiVerticalTab(Element):
         return r'\v'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Backslash(Element):
     """ASCII backslash element."""
 
@@ -652,7 +726,7 @@ class Backslash(Element):
         return r'\\'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StartOfString(Element):
     """Start of string element."""
 
@@ -660,7 +734,7 @@ class StartOfString(Element):
         return r'\A'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EndOfString(Element):
     """End of string element."""
 
@@ -668,45 +742,50 @@ class EndOfString(Element):
         return r'\Z'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Hex(Element):
     code: str
 
     def __post_init__(self) -> None:
-        if len(self.code) != 2 or set(self.code) - HEX_DIGITS:
+        if len(self.code) != 2 or not HEX_CODE.fullmatch(self.code):
             raise ValueError(f'Invalid hex char {self.code!r}')
 
     def __str__(self) -> str:
         return f'\\x{self.code}'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Unicode(Element):
     code: str
 
     def __post_init__(self) -> None:
-        str(self)
+        _unicode_escape(self.code)
 
     def __str__(self) -> str:
-        # Check if named unicode character
+        return _unicode_escape(self.code)
+
+
+@lru_cache(maxsize=1024)
+def _unicode_escape(code: str) -> str:
+    # Check if named unicode character
+    try:
+        unicodedata.lookup(code)
+    except KeyError:
+        pass
+    else:
+        return f'\\N{{{code}}}'
+
+    # Check if single byte code
+    if len(code) == 4 and HEX_CODE.fullmatch(code):
+        return f'\\u{code}'
+
+    # Check if double byte code
+    if 4 < len(code) <= 8 and HEX_CODE.fullmatch(code):
         try:
-            unicodedata.lookup(self.code)
-        except KeyError:
+            chr(int(code, 16))
+        except ValueError:
             pass
         else:
-            return f'\\N{{{self.code}}}'
-
-        # Check if single byte self.code
-        if len(self.code) == 4 and not set(self.code) - HEX_DIGITS:
-            return f'\\u{self.code}'
-
-        # Check if double byte self.code
-        if 4 < len(self.code) <= 8 and not set(self.code) - HEX_DIGITS:
-            try:
-                chr(int(self.code, 16))
-            except ValueError:
-                pass
-            else:
-                return f'\\U{self.code}'
+            return f'\\U{code}'
 
-        raise ValueError(f'Invalid unicode char {self.code!r}')
+    raise ValueError(f'Invalid unicode char {code!r}')
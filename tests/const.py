@@ -1,11 +1,17 @@
 """Some test constants."""
 
+from functools import lru_cache
+import sys
+from typing import Dict
 import unicodedata
 
-NAMED_UNICODE = {}
 
-for n in range(0x000000, 0x11FFFF + 1):
-    try:
-        NAMED_UNICODE[chr(n)] = unicodedata.name(chr(n))
-    except ValueError:
-        pass
+@lru_cache(maxsize=None)
+def named_unicode() -> Dict[str, str]:
+    """Map every named code point to its Unicode name, built on first use."""
+    names = {}
+    for n in range(0x000000, sys.maxunicode + 1):
+        name = unicodedata.name(chr(n), None)
+        if name is not None:
+            names[chr(n)] = name
+    return names
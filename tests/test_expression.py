@@ -1,15 +1,18 @@
 """Test core expression functionality."""
 
+from dataclasses import replace
 import re
-from typing import Optional
-import unicodedata
 
 from hypothesis import example, given
-from hypothesis.strategies import integers, sampled_from
+from hypothesis.strategies import deferred, integers, sampled_from
 import pytest
 
 from superexpressive import SuperExpressive
-from tests.const import NAMED_UNICODE
+from superexpressive.types import (AnyChar, Backreference, Between, Capture,
+                                   Char, Digit, Element, EndOfInput, Exactly,
+                                   NamedCapture, Opt, Quantifier, Root,
+                                   StartOfInput, String, Tab, Word)
+from tests.const import named_unicode
 
 
 def test_empty() -> None:
@@ -21,12 +24,20 @@ def test_empty() -> None:
     (SuperExpressive().case_insensitive, re.IGNORECASE | re.UNICODE),
     (SuperExpressive().unicode, re.UNICODE),
     (SuperExpressive().ascii, re.ASCII),
+    (SuperExpressive().ascii.unicode, re.UNICODE),
+    (SuperExpressive().ascii.case_insensitive, re.ASCII | re.IGNORECASE),
     (SuperExpressive().single_line, re.DOTALL | re.UNICODE),
 ])
 def test_flags(se: SuperExpressive, flags: int) -> None:
     assert se.compile().flags == flags
 
 
+def test_compile_cached() -> None:
+    se = SuperExpressive().string('hello').digit
+    assert se.compile() is se.compile()
+    assert se.digit.compile() is not se.compile()
+
+
 @pytest.mark.parametrize('se, string', [
     (SuperExpressive().any_char, '.'),
     (SuperExpressive().whitespace_char, r'\s'),
@@ -46,6 +57,22 @@ def test_escapes(se: SuperExpressive, string: str) -> None:
     assert str(se) == string
 
 
+def test_incremental_rendering() -> None:
+    se = SuperExpressive().string('a').group.digit
+    assert str(se) == r'a(?:\d)'
+    se = se.word.end().optional.capture.tab
+    assert str(se) == r'a(?:\d\w)(\t)?'
+    assert str(se.end().char('!')) == r'a(?:\d\w)(\t)?!'
+
+
+def test_rendering_follows_stack() -> None:
+    stack = (Root(children=(Word(),)),)
+    rendered = SuperExpressive().digit
+    assert str(rendered) == r'\d'
+    assert str(replace(rendered, stack=stack)) == r'\w'
+    assert str(SuperExpressive(stack=stack)) == r'\w'
+
+
 def test_any_of_basic():
     assert str(
         SuperExpressive()
@@ -118,6 +145,12 @@ def test_named_capture_bad_name():
          .end())
 
 
+@pytest.mark.parametrize('name', ['', '1st', '_name', 'a-b', 'ünï'])
+def test_named_capture_invalid_names(name: str) -> None:
+    with pytest.raises(ValueError):
+        SuperExpressive().named_capture(name)
+
+
 def test_named_capture_duplicate_name():
     with pytest.raises(ValueError):
         (SuperExpressive()
@@ -167,6 +200,11 @@ def test_backreference_missing():
         SuperExpressive().backreference(1)
 
 
+def test_backreference_zero():
+    with pytest.raises(ValueError):
+        SuperExpressive().capture.digit.end().backreference(0)
+
+
 def test_group():
     assert str(
         SuperExpressive()
@@ -218,12 +256,18 @@ def test_quantifier(se: SuperExpressive, expected) -> None:
     assert str(se) == expected
 
 
+def test_quantifier_abstract() -> None:
+    with pytest.raises(TypeError):
+        Quantifier(child=Digit())
+
+
 @pytest.mark.parametrize('se, expected', [
     (SuperExpressive().start_of_input, r'^'),
     (SuperExpressive().end_of_input, r'$'),
     (SuperExpressive().any_of_chars('aeiou.-'), r'[aeiou\.\-]'),
     (SuperExpressive().anything_but_chars('aeiou.-'), r'[^aeiou\.\-]'),
     (SuperExpressive().anything_but_range('0', '9'), r'[^0-9]'),
+    (SuperExpressive().anything_but_string('a.b'), r'(?:[^a][^\.][^b])'),
     (SuperExpressive().string('hello'), r'hello'),
     (SuperExpressive().string('h'), r'h'),
     (SuperExpressive().range('a', 'z'), r'[a-z]'),
@@ -232,6 +276,51 @@ def test_simple_matchers(se: SuperExpressive, expected) -> None:
     assert str(se) == expected
 
 
+def test_then() -> None:
+    assert str(
+        SuperExpressive()
+            .then(Digit(), String('hello'), Word())
+            .one_or_more.then(Digit(), AnyChar())
+            .capture
+                .then(Char('!'), Tab())
+            .end()
+    ) == r'\dhello\w\d+.(!\t)'
+
+
+@pytest.mark.parametrize('element, error', [
+    (Capture(), ValueError),
+    (Opt(), ValueError),
+    (StartOfInput(), ValueError),
+    (EndOfInput(), ValueError),
+    (Backreference(index=1), ValueError),
+    ('a.b', TypeError),
+    (3, TypeError),
+])
+def test_then_not_batchable(element: Element, error: type) -> None:
+    with pytest.raises(error):
+        SuperExpressive().then(Digit(), element)
+
+
+def test_start_end_defined() -> None:
+    se = SuperExpressive(check_simple_start_and_end=True)
+    with pytest.raises(RuntimeError):
+        _ = se.start_of_input.start_of_input
+    with pytest.raises(RuntimeError):
+        _ = se.end_of_input.end_of_input
+    with pytest.raises(RuntimeError):
+        _ = se.end_of_input.start_of_input
+    assert str(se.start_of_input.end_of_input) == '^$'
+
+
+@pytest.mark.parametrize('element, expected', [
+    (Exactly(3, Digit()), r'\d{3}'),
+    (Between(1, 2, Digit()), r'\d{1,2}'),
+    (NamedCapture('x', (Digit(),)), r'(?P<x>\d)'),
+])
+def test_positional_elements(element: Element, expected: str) -> None:
+    assert str(element) == expected
+
+
 def test_char_more_than_one_char() -> None:
     with pytest.raises(ValueError):
         SuperExpressive().char('hello')
@@ -271,7 +360,7 @@ def test_single_unicode_char(n: int) -> None:
     assert str(SuperExpressive().unicode_char(code)) == f'\\u{code}'
 
 
-@given(integers(0x00, 0x00110000))
+@given(integers(0x00, 0x00110000 - 1))
 @example(0x00)
 @example(0x00110000 - 1)
 def test_double_unicode_char(n: int) -> None:
@@ -279,14 +368,12 @@ def test_double_unicode_char(n: int) -> None:
     assert str(SuperExpressive().unicode_char(code)) == f'\\U{code}'
 
 
-def _unicode_name(n: int) -> Optional[str]:
-    try:
-        return unicodedata.name(chr(n))
-    except ValueError:
-        return None
+@given(deferred(lambda: sampled_from(sorted(named_unicode()))))
+def test_named_unicode_char(character: str) -> None:
+    name = named_unicode()[character]
+    assert str(SuperExpressive().unicode_char(name)) == f'\\N{{{name}}}'
 
 
-@given(sampled_from(sorted(NAMED_UNICODE)))
-def test_double_unicode_char(character: str) -> None:
-    name = NAMED_UNICODE[character]
-    assert str(SuperExpressive().unicode_char(name)) == f'\\N{{{name}}}'
+def test_unknown_attribute() -> None:
+    with pytest.raises(AttributeError):
+        _ = SuperExpressive().startOfInput
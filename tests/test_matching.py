@@ -1,2 +1,23 @@
 """Test practical matching examples."""
 
+
+from superexpressive import SuperExpressive
+
+
+def test_match() -> None:
+    se = SuperExpressive().start_of_input.one_or_more.digit.char('-')
+    assert se.match('123-456').group() == '123-'
+    assert se.match('abc-456') is None
+
+
+def test_match_multiple() -> None:
+    se = SuperExpressive().allow_multiple_matches.one_or_more.digit
+    assert se.match('1a22b333') == ['1', '22', '333']
+    assert se.match('abc') == []
+
+
+def test_match_reuses_pattern() -> None:
+    se = SuperExpressive().allow_multiple_matches.one_or_more.digit
+    pattern = se.compile()
+    se.match('1a22b333')
+    assert se.compile() is pattern
@@ -1,176 +1,233 @@
 """Test subexpressions."""
 
+from functools import lru_cache
+
 import pytest
 
 from superexpressive import SuperExpressive
 
-SIMPLE = (SuperExpressive()
-              .string('hello')
-              .any_char
-              .string('world'))
-
-FLAGS = (SuperExpressive()
-             .unicode
-             .case_insensitive
-             .string('hello')
-             .any_char
-             .string('world'))
-
-START_END = (SuperExpressive()
-                 .start_of_input
-                 .string('hello')
-                 .any_char
-                 .string('world')
-                 .end_of_input)
-
-NAMED_CAPTURE = (SuperExpressive()
-                    .named_capture('module')
-                    .exactly(2).any_char
-                    .end()
-                    .named_backreference('module'))
-
-INDEXED_BACKREFERENCE = (SuperExpressive()
-                             .capture
-                             .exactly(2).any_char
-                             .end()
-                             .backreference(1))
-
-SECOND_LAYER = SuperExpressive().exactly(2).any_char
-FIRST_LAYER = (SuperExpressive()
-               .string('outer begin')
-               .named_capture('innerSubExpression')
-               .optional.subexpression(SECOND_LAYER)
-               .end()
-               .string('outer end'))
 
+# Test expressions are built on first use, so a partial run only pays for
+# the ones its selected tests need
 
-def test_wrong_input_type():
-    with pytest.raises(Exception):
-        SuperExpressive().subexpression('nope')
+@lru_cache(maxsize=None)
+def simple() -> SuperExpressive:
+    return (SuperExpressive()
+                .string('hello')
+                .any_char
+                .string('world'))
 
 
-def test_simple():
-    assert str(
-        SuperExpressive()
-            .start_of_input
-            .at_least(3).digit
-            .subexpression(SIMPLE)
-            .range('0', '9')
-            .end_of_input
-    ) == r'^\d{3,}hello.world[0-9]$'
+@lru_cache(maxsize=None)
+def flags() -> SuperExpressive:
+    return (SuperExpressive()
+                .unicode
+                .case_insensitive
+                .string('hello')
+                .any_char
+                .string('world'))
 
 
-def test_simple_quantified():
-    assert str(
-        SuperExpressive()
-            .start_of_input
-            .at_least(3).digit
-            .one_or_more.subexpression(SIMPLE)
-            .range('0', '9')
-            .end_of_input
-    ) == r'^\d{3,}(?:hello.world)+[0-9]$'
+@lru_cache(maxsize=None)
+def line_by_line() -> SuperExpressive:
+    return SuperExpressive().line_by_line
 
 
-def test_ignore_flags():
-    assert (
-        SuperExpressive()
-            .line_by_line
-            .start_of_input
-            .at_least(3).digit
-            .subexpression(FLAGS, ignore_flags=True)
-            .range('0', '9')
-            .end_of_input
-            .compile()
-    ).flags == SuperExpressive().line_by_line.compile().flags
+@lru_cache(maxsize=None)
+def start_end() -> SuperExpressive:
+    return (SuperExpressive()
+                .start_of_input
+                .string('hello')
+                .any_char
+                .string('world')
+                .end_of_input)
 
 
-def test_flags_merge():
-    assert (
-        SuperExpressive()
-            .line_by_line
-            .start_of_input
-            .at_least(3).digit
-            .subexpression(FLAGS, ignore_flags=False)
-            .range('0', '9')
-            .end_of_input
-            .compile()
-    ).flags == (FLAGS.compile().flags
-                | SuperExpressive().line_by_line.compile().flags)
+@lru_cache(maxsize=None)
+def named_capture() -> SuperExpressive:
+    return (SuperExpressive()
+                .named_capture('module')
+                .exactly(2).any_char
+                .end()
+                .named_backreference('module'))
 
 
-def test_start_end():
-    assert str(
-        SuperExpressive(check_simple_start_and_end=True)
-            .at_least(3).digit
-            .subexpression(START_END, ignore_start_and_end=False)
-            .range('0', '9')
-    ) == r'\d{3,}^hello.world$[0-9]'
+@lru_cache(maxsize=None)
+def indexed_backreference() -> SuperExpressive:
+    return (SuperExpressive()
+                .capture
+                .exactly(2).any_char
+                .end()
+                .backreference(1))
 
 
-def test_clashing_start_end():
-    with pytest.raises(ValueError):
-        (SuperExpressive(check_simple_start_and_end=True)
-            .end_of_input
-            .subexpression(START_END, ignore_start_and_end=False))
+@lru_cache(maxsize=None)
+def second_layer() -> SuperExpressive:
+    return SuperExpressive().exactly(2).any_char
 
 
-def test_no_namespacing():
-    assert str(
-        SuperExpressive()
-            .at_least(3).digit
-            .subexpression(NAMED_CAPTURE)
-            .range('0', '9')
-    ) == r'\d{3,}(?P<module>.{2})\g<module>[0-9]'
+@lru_cache(maxsize=None)
+def first_layer() -> SuperExpressive:
+    return (SuperExpressive()
+                .string('outer begin')
+                .named_capture('innerSubExpression')
+                .optional.subexpression(second_layer())
+                .end()
+                .string('outer end'))
 
 
-def test_namespacing():
-    assert str(
-        SuperExpressive()
-            .at_least(3).digit
-            .subexpression(NAMED_CAPTURE, namespace='yolo')
-            .range('0', '9')
-    ) == r'\d{3,}(?P<yolomodule>.{2})\g<yolomodule>[0-9]'
+# Builders are immutable, so chains can share a common prefix
 
+@lru_cache(maxsize=None)
+def digits() -> SuperExpressive:
+    return SuperExpressive().at_least(3).digit
 
-def test_name_collision():
-    with pytest.raises(ValueError):
-        (SuperExpressive()
-            .named_capture('module')
-                .at_least(3).digit
-            .end()
-            .subexpression(NAMED_CAPTURE)
-            .range('0', '9'))
+
+@lru_cache(maxsize=None)
+def start_digits() -> SuperExpressive:
+    return SuperExpressive().start_of_input.at_least(3).digit
+
+
+@lru_cache(maxsize=None)
+def captured_digits() -> SuperExpressive:
+    return (SuperExpressive()
+                .capture
+                    .at_least(3).digit
+                .end())
+
+
+def test_wrong_input_type():
+    with pytest.raises(TypeError):
+        SuperExpressive().subexpression('nope')
+
+
+@pytest.mark.parametrize('factory, expected', [
+    pytest.param(
+        lambda: (start_digits()
+                     .subexpression(simple())
+                     .range('0', '9')
+                     .end_of_input),
+        r'^\d{3,}hello.world[0-9]$',
+        id='simple',
+    ),
+    pytest.param(
+        lambda: (start_digits()
+                     .one_or_more.subexpression(simple())
+                     .range('0', '9')
+                     .end_of_input),
+        r'^\d{3,}(?:hello.world)+[0-9]$',
+        id='simple_quantified',
+    ),
+    pytest.param(
+        lambda: (SuperExpressive(check_simple_start_and_end=True)
+                     .at_least(3).digit
+                     .subexpression(start_end(), ignore_start_and_end=False)
+                     .range('0', '9')),
+        r'\d{3,}^hello.world$[0-9]',
+        id='start_end',
+    ),
+    pytest.param(
+        lambda: (digits()
+                     .subexpression(named_capture())
+                     .range('0', '9')),
+        r'\d{3,}(?P<module>.{2})\g<module>[0-9]',
+        id='no_namespacing',
+    ),
+    pytest.param(
+        lambda: (digits()
+                     .subexpression(named_capture(), namespace='yolo')
+                     .range('0', '9')),
+        r'\d{3,}(?P<yolomodule>.{2})\g<yolomodule>[0-9]',
+        id='namespacing',
+    ),
+    pytest.param(
+        lambda: (captured_digits()
+                     .subexpression(indexed_backreference())
+                     .backreference(1)
+                     .range('0', '9')),
+        r'(\d{3,})(.{2})\2\1[0-9]',
+        id='indexed_backreferencing',
+    ),
+    pytest.param(
+        lambda: (captured_digits()
+                     .subexpression(first_layer())
+                     .backreference(1)
+                     .range('0', '9')),
+        r'(\d{3,})outer begin(?P<innerSubExpression>(?:.{2})?)outer end'
+        r'\1[0-9]',
+        id='deeply_nested',
+    ),
+    pytest.param(
+        lambda: (captured_digits()
+                     .subexpression(indexed_backreference())
+                     .backreference(2)),
+        r'(\d{3,})(.{2})\2\2',
+        id='backreference_after_subexpression',
+    ),
+])
+def test_subexpression(factory, expected):
+    assert str(factory()) == expected
+
+
+def test_simple_not_rewritten():
+    merged = SuperExpressive().subexpression(simple())
+    assert merged.stack[0].children[0].children is simple().stack[0].children
+
+
+def test_ignore_flags():
+    assert (
+        start_digits()
+            .line_by_line
+            .subexpression(flags(), ignore_flags=True)
+            .range('0', '9')
+            .end_of_input
+            .compile()
+    ).flags == line_by_line().flags
 
 
-def test_name_collision_with_namespace():
+def test_flags_merge():
+    assert (
+        start_digits()
+            .line_by_line
+            .subexpression(flags(), ignore_flags=False)
+            .range('0', '9')
+            .end_of_input
+            .compile()
+    ).flags == flags().flags | line_by_line().flags
+
+
+@pytest.mark.parametrize('factory', [
+    pytest.param(
+        lambda: (SuperExpressive()
+                     .ascii
+                     .subexpression(flags(), ignore_flags=False)),
+        id='incompatible_flags',
+    ),
+    pytest.param(
+        lambda: (SuperExpressive(check_simple_start_and_end=True)
+                     .end_of_input
+                     .subexpression(start_end(), ignore_start_and_end=False)),
+        id='clashing_start_end',
+    ),
+    pytest.param(
+        lambda: (SuperExpressive()
+                     .named_capture('module')
+                         .at_least(3).digit
+                     .end()
+                     .subexpression(named_capture())
+                     .range('0', '9')),
+        id='name_collision',
+    ),
+    pytest.param(
+        lambda: (SuperExpressive()
+                     .named_capture('yolomodule')
+                         .at_least(3).digit
+                     .end()
+                     .subexpression(named_capture(), namespace='yolo')
+                     .range('0', '9')),
+        id='name_collision_with_namespace',
+    ),
+])
+def test_invalid_subexpression(factory):
     with pytest.raises(ValueError):
-        (SuperExpressive()
-            .named_capture('yolomodule')
-                .at_least(3).digit
-            .end()
-            .subexpression(NAMED_CAPTURE, namespace='yolo')
-            .range('0', '9'))
-
-
-def test_indexed_backreferencing():
-    assert str(
-        SuperExpressive()
-        .capture
-            .at_least(3).digit
-        .end()
-        .subexpression(INDEXED_BACKREFERENCE)
-        .backreference(1)
-        .range('0', '9')
-    ) == r'(\d{3,})(.{2})\2\1[0-9]'
-
-
-def test_deeply_nested():
-    assert str(
-        SuperExpressive()
-        .capture
-            .at_least(3).digit
-        .end()
-        .subexpression(FIRST_LAYER)
-        .backreference(1)
-        .range('0', '9')
-    ) == r'(\d{3,})outer begin(?P<innerSubExpression>(?:.{2})?)outer end\1[0-9]'
+        factory()